@@ -8,18 +8,247 @@ creates Jira tickets and sends notifications.
 """
 
 import os
+import argparse
+import asyncio
+import atexit
 import logging
-import json
+import logging.handlers
+import queue
+import threading
+import re
+import socket
+import time
+import types
+import redis
+import redis.asyncio as aioredis
 import yaml
-from typing import Dict, Optional, Tuple
-from datetime import datetime
-
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
-from jira import JIRA
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from cachetools import TTLCache
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+from jira import JIRA, JIRAError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, RequestException
+from tenacity import (
+    before_sleep_log, retry, retry_if_exception, stop_after_attempt, stop_after_delay,
+    wait_exponential_jitter
+)
+from urllib3.exceptions import NewConnectionError
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+try:
+    # Faster parsing of Claude tool input; the stdlib parser is used if orjson is missing
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Minimum seconds between conversations_list refreshes triggered by unknown channels
+CHANNEL_REFRESH_INTERVAL = 60
+
+# Slack user lookups are cached since a few reporters produce most messages
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 3600
+
+# Recently seen (channel, ts) pairs, so Slack redeliveries don't create duplicate tickets
+SEEN_EVENTS_SIZE = 10_000
+SEEN_EVENTS_TTL = 300
+
+# Redis keys used when state is shared between replicas (redis.url is set)
+REDIS_SEEN_KEY = "slack:seen:{channel}:{ts}"
+REDIS_USER_KEY = "slack:user:{user_id}"
+REDIS_TRANSITIONS_KEY = "jira:transitions"
+# Stream of monitored messages drained by a consumer group of agent replicas
+REDIS_STREAM = "slack:messages"
+REDIS_STREAM_MAXLEN = 10_000
+REDIS_GROUP = "jira-slack-agents"
+# Entries left unacknowledged this long (e.g. by a crashed replica) are taken over.
+# Must stay well above the worst-case time to process one message (Claude calls
+# plus bounded Jira retries), or a message still in progress is processed twice.
+REDIS_CLAIM_IDLE_MS = 1_800_000
+REDIS_CLAIM_INTERVAL = 60
+# Entries that reach another claim after this many unacknowledged deliveries are
+# moved to the dead-letter stream instead of being retried forever
+REDIS_MAX_DELIVERIES = 5
+REDIS_DEAD_LETTER_STREAM = "slack:messages:dead"
+
+# Defaults for optional settings in the `ai` config section
+AI_DEFAULTS = {
+    # Two-tier classifier: a fast model handles most messages, decisions with confidence
+    # inside the escalation band are re-checked by the larger escalation model
+    'model': None,
+    'fast_model': "claude-haiku-4-5",
+    'escalation_model': None,
+    'escalation_band': (0.4, 0.7),
+    # A decision is ~150 tokens; batched prompts get this much per message. A decision
+    # cut off at this limit is requested once more with MAX_TOKENS_RETRY_FACTOR times it
+    'max_tokens': 256,
+    # Longer messages are cut to this many characters (head + tail) before analysis
+    'max_chars': 4096,
+    'prefilter': True,
+    'prefilter_keywords': None,
+    'prefilter_min_length': 20,
+    'batch_max': 1,
+    'batch_window_ms': 2000,
+    'batch_mode': False,
+    'batch_mode_channels': {},
+    'batch_flush_minutes': 10,
+}
+
+# Default number of messages processed concurrently; also sizes the thread pool
+# that runs the blocking Jira and Anthropic SDK calls
+DEFAULT_MAX_WORKERS = 16
+
+# Jira calls are retried here only; the SDK session is built with max_retries=0.
+# Reads are retried on rate limiting (429), server errors (5xx) and any transport
+# error. Issue creation and transitions are not idempotent, so they are retried
+# only when Jira cannot have acted on the request: 429/503 responses, or a
+# failure to connect at all.
+JIRA_READ_RETRY_STATUSES = {429, 500, 502, 503, 504}
+JIRA_WRITE_RETRY_STATUSES = {429, 503}
+JIRA_RETRY_ATTEMPTS = 5
+# Upper bound for a single wait (including Retry-After) and for the whole call,
+# so a rate-limited request cannot hold a worker thread and message slot for long
+JIRA_RETRY_MAX_WAIT = 30
+JIRA_RETRY_DEADLINE = 90
+_jira_backoff = wait_exponential_jitter(initial=0.5, max=JIRA_RETRY_MAX_WAIT)
+
+
+def _is_connect_error(exc: BaseException) -> bool:
+    """Check whether a request failed before a connection to Jira was established."""
+    if isinstance(exc, ConnectTimeout):
+        return True
+    if isinstance(exc, RequestsConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+def _is_transient_jira_read_error(exc: BaseException) -> bool:
+    """Check whether a read-only Jira call failed with an error worth retrying."""
+    if isinstance(exc, JIRAError):
+        return exc.status_code in JIRA_READ_RETRY_STATUSES
+    return isinstance(exc, RequestException)
+
+
+def _is_transient_jira_write_error(exc: BaseException) -> bool:
+    """Check whether a Jira write failed in a way that guarantees it was not applied."""
+    if isinstance(exc, JIRAError):
+        return exc.status_code in JIRA_WRITE_RETRY_STATUSES
+    return _is_connect_error(exc)
+
+
+def _jira_retry_wait(retry_state) -> float:
+    """Exponential backoff with jitter, honoring Jira's Retry-After header up to a cap."""
+    delay = _jira_backoff(retry_state)
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return min(delay, JIRA_RETRY_MAX_WAIT)
+
+
+def _jira_retry_policy(is_transient):
+    """Build a tenacity retry decorator for Jira calls with the given error check."""
+    return retry(
+        stop=stop_after_attempt(JIRA_RETRY_ATTEMPTS) | stop_after_delay(JIRA_RETRY_DEADLINE),
+        wait=_jira_retry_wait,
+        retry=retry_if_exception(is_transient),
+        before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
+        reraise=True
+    )
+
+
+jira_read_retry = _jira_retry_policy(_is_transient_jira_read_error)
+jira_write_retry = _jira_retry_policy(_is_transient_jira_write_error)
+
+# Seconds between status checks of a submitted Message Batches API batch
+BATCH_POLL_INTERVAL = 60
+
+# Cheap signal check run before calling Claude; messages without any match are skipped
+DEFAULT_PREFILTER_PATTERN = (
+    r"\b(bug|error|broken|crash(es|ed|ing)?|fail(s|ed|ing|ure)?|can[’']?t|cannot|issue|"
+    r"stack\s?trace|exception|todo|please|can (you|we|someone)|does(n[’']?t| not) work|"
+    r"not working|feature request)\b|Traceback|Error:|\?"
+)
+
+# Instructions shared by every analysis request. Sent as a cached system block so
+# repeated calls only pay full input-token price for the message itself.
+STATIC_INSTRUCTIONS = """You analyze Slack messages and determine if they describe a bug report, task request, or issue that should be tracked in Jira.
+
+Record your decision for each message with the provided tool, always filling in should_create_ticket first.
+
+Guidelines:
+- For bugs: Look for error messages, unexpected behavior, crashes, or things not working
+- For tasks: Look for requests to implement features, make changes, or do work
+- For improvements: Look for suggestions to enhance existing functionality
+- Summary should be concise and actionable
+- Description should include relevant details from the message
+- Set appropriate priority based on urgency indicators in the message"""
+
+DETECTION_MODE_HINTS = {
+    "liberal": "generous and create tickets for anything that might need tracking",
+    "conservative": "strict and only create tickets for clear bug reports or task requests",
+}
+
+# Per-process settings appended to the static instructions, still inside the cached block
+SYSTEM_PROMPT_TEMPLATE = (
+    STATIC_INSTRUCTIONS + "\n"
+    "- Confidence threshold is {threshold} - only create tickets if confidence is above this\n\n"
+    "Detection mode: {detection_mode} (be {mode_hint})"
+)
+
+MESSAGE_PROMPT_TEMPLATE = 'Message: "{message_text}"'
+
+# Structured decision returned by Claude through forced tool use
+DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "should_create_ticket": {"type": "boolean"},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "issue_type": {"type": "string", "enum": ["Bug", "Task", "Story", "Improvement"]},
+        "summary": {"type": "string", "maxLength": 100, "description": "Brief one-line summary (max 100 chars)"},
+        "description": {
+            "type": "string",
+            "maxLength": 500,
+            "description": "Concise description extracted from the message, at most 3 sentences (max 500 chars)"
+        },
+        "priority": {"type": "string", "enum": ["Highest", "High", "Medium", "Low", "Lowest"]},
+        "reasoning": {"type": "string", "maxLength": 150, "description": "One-sentence explanation of your decision (max 150 chars)"}
+    },
+    "required": ["should_create_ticket", "confidence", "issue_type", "summary", "description", "priority", "reasoning"]
+}
+
+# Jira summaries built from the message text are cut to this length
+SUMMARY_MAX_CHARS = 100
+
+# A decision cut off by max_tokens is requested once more with this many times the budget
+MAX_TOKENS_RETRY_FACTOR = 4
+
+# Matches the decision field in streamed tool input so negatives can stop generation early
+DECISION_FIELD_RE = re.compile(r'"should_create_ticket"\s*:\s*(true|false)')
+
+TICKET_DECISION_TOOL = {
+    "name": "create_ticket_decision",
+    "description": "Record whether a Slack message should become a Jira ticket.",
+    "input_schema": DECISION_SCHEMA
+}
+
+TICKET_DECISIONS_TOOL = {
+    "name": "create_ticket_decisions",
+    "description": "Record whether each Slack message should become a Jira ticket, one decision per message in order.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "decisions": {"type": "array", "items": DECISION_SCHEMA}
+        },
+        "required": ["decisions"]
+    }
+}
+
 
 class JiraSlackAgent:
     """Main agent class that coordinates Slack monitoring, AI detection, and Jira ticket creation."""
@@ -31,7 +260,19 @@ class JiraSlackAgent:
 
         # Load configuration
         with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+            self.config = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+        # Materialize settings read on the message path as attributes
+        self._ai = types.SimpleNamespace(**{**AI_DEFAULTS, **self.config['ai']})
+        self._ai.escalation_model = self._ai.escalation_model or self._ai.model
+        self._jira_url = self.config['jira']['url']
+        self._project_key = self.config['jira']['project_key']
+        self._default_issue_type = self.config['jira']['default_issue_type']
+        self._default_priority = self.config['jira']['default_priority']
+        self._initial_status = self.config['jira'].get('initial_status')
+        self._monitored_channels = frozenset(self.config['slack']['monitored_channels'])
+        self._max_workers = self.config['slack'].get('max_workers', DEFAULT_MAX_WORKERS)
+        self._notification_channel = self.config['slack']['notification_channel']
 
         # Setup logging
         self._setup_logging()
@@ -41,6 +282,50 @@ class JiraSlackAgent:
         self.jira_client = self._init_jira()
         self.anthropic_client = self._init_anthropic()
 
+        # Issue types whose create screen accepts a priority (None if unknown)
+        self._priority_issue_types = self._probe_priority_support()
+
+        # Optional Redis shared state so several replicas can run side by side.
+        # The async client serves the event loop, the sync one the worker threads.
+        self._redis, self._redis_sync = self._init_redis()
+        self._use_stream = self._redis is not None and self.config['redis'].get('stream', False)
+        self._consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+
+        # Pre-filter for messages worth sending to Claude
+        self._signal_re = self._compile_prefilter()
+
+        # Analysis system prompt, fixed for the life of the process
+        self._system_blocks = self._build_system_prompt()
+
+        # Channel ID lookups, resolved from monitored channel names at startup
+        self._channel_name_by_id: Dict[str, str] = {}
+        self._monitored_channel_ids: FrozenSet[str] = frozenset()
+        self._channels_refreshed_at = 0.0
+        self._channels_lock: Optional[asyncio.Lock] = None
+
+        # (channel_id, ts) of recently handled messages
+        self._seen_events = TTLCache(maxsize=SEEN_EVENTS_SIZE, ttl=SEEN_EVENTS_TTL)
+
+        # user_id -> (real_name, email)
+        self._user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+        # Bounds concurrently processed messages, created on the event loop
+        self._message_slots: Optional[asyncio.Semaphore] = None
+
+        # Batched analysis queue, created on the event loop when ai.batch_max > 1
+        self._analysis_queue: Optional[asyncio.Queue] = None
+        self._background_tasks = set()
+
+        # Classifier tier usage: 'fast' or 'escalated', updated from worker threads
+        self._tier_hits = Counter()
+        self._tier_hits_lock = threading.Lock()
+
+        # (project_key, issue_type, from_status, to_status) -> Jira transition ID
+        self._transition_cache: Dict[Tuple[str, str, str, str], str] = {}
+
+        # Messages waiting to be submitted to the Message Batches API, keyed by custom_id
+        self._pending_batch_requests: Dict[str, Tuple[Dict, str]] = {}
+
         # Register Slack event handlers
         self._register_handlers()
 
@@ -52,17 +337,34 @@ class JiraSlackAgent:
         log_level = getattr(logging, log_config.get('level', 'INFO'))
         log_file = log_config.get('file', 'agent.log')
 
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=log_config.get('max_bytes', 10 * 1024 * 1024),
+            backupCount=log_config.get('backup_count', 5),
+            encoding='utf-8'
+        )
+        stream_handler = logging.StreamHandler()
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+
+        # Log records are queued and written by a background thread so disk I/O
+        # stays off the message handling path. The QueueHandler is left without a
+        # formatter so records are only formatted once, by the listener's handlers.
+        log_queue = queue.Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(log_level)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
         )
+        self._log_listener.start()
+        # Flush queued records on any exit, including startup failures
+        atexit.register(self._log_listener.stop)
+
         self.logger = logging.getLogger(__name__)
 
-    def _init_slack(self) -> App:
+    def _init_slack(self) -> AsyncApp:
         """Initialize Slack app."""
         token = os.getenv('SLACK_BOT_TOKEN')
         signing_secret = os.getenv('SLACK_SIGNING_SECRET')
@@ -70,7 +372,7 @@ class JiraSlackAgent:
         if not token or not signing_secret:
             raise ValueError("SLACK_BOT_TOKEN and SLACK_SIGNING_SECRET must be set in .env file")
 
-        app = App(token=token, signing_secret=signing_secret)
+        app = AsyncApp(token=token, signing_secret=signing_secret)
         self.logger.info("Slack app initialized")
         return app
 
@@ -78,18 +380,84 @@ class JiraSlackAgent:
         """Initialize Jira client."""
         jira_email = os.getenv('JIRA_EMAIL')
         jira_token = os.getenv('JIRA_API_TOKEN')
-        jira_url = self.config['jira']['url']
+        jira_url = self._jira_url
 
         if not jira_email or not jira_token:
             raise ValueError("JIRA_EMAIL and JIRA_API_TOKEN must be set in .env file")
 
         jira = JIRA(
             server=jira_url,
-            basic_auth=(jira_email, jira_token)
+            basic_auth=(jira_email, jira_token),
+            max_retries=0
         )
+
+        # Keep connections alive across requests; retries are handled in one place
+        # (see jira_read_retry/jira_write_retry), not by the session or transport
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        jira._session.mount("https://", adapter)
+        jira._session.mount("http://", adapter)
+
         self.logger.info(f"Jira client initialized for {jira_url}")
         return jira
 
+    def _init_redis(self) -> Tuple[Optional[aioredis.Redis], Optional[redis.Redis]]:
+        """Initialize Redis clients for shared state, if configured."""
+        redis_url = self.config.get('redis', {}).get('url')
+        if not redis_url:
+            return None, None
+
+        clients = (
+            aioredis.Redis.from_url(redis_url, decode_responses=True),
+            redis.Redis.from_url(redis_url, decode_responses=True)
+        )
+        self.logger.info("Redis shared state enabled")
+        return clients
+
+    def _probe_priority_support(self) -> Optional[FrozenSet[str]]:
+        """
+        Ask Jira once which issue types in the project accept a priority on create.
+
+        Returns:
+            Set of issue type names, or None if the create metadata is unavailable
+        """
+        try:
+            supported = self._priority_issue_types_from_createmeta()
+        except Exception as e:
+            # Jira Server/DC 9+ dropped the combined createmeta endpoint
+            self.logger.debug(f"createmeta unavailable, reading per issue type metadata: {str(e)}")
+            try:
+                supported = self._priority_issue_types_from_project_fields()
+            except Exception as e:
+                self.logger.warning(f"Could not read Jira create metadata, priority will always be sent: {str(e)}")
+                return None
+
+        self.logger.info(
+            f"Priority field available for issue types: {', '.join(sorted(supported)) or 'none'}"
+        )
+        return supported
+
+    def _priority_issue_types_from_createmeta(self) -> FrozenSet[str]:
+        """Read priority support from the combined createmeta endpoint."""
+        meta = self.jira_client.createmeta(
+            projectKeys=self._project_key,
+            expand='projects.issuetypes.fields'
+        )
+        return frozenset(
+            issue_type['name'] for issue_type in meta['projects'][0]['issuetypes']
+            if 'priority' in issue_type.get('fields', {})
+        )
+
+    def _priority_issue_types_from_project_fields(self) -> FrozenSet[str]:
+        """Read priority support from the per issue type createmeta endpoints."""
+        supported = set()
+        for issue_type in self.jira_client.project_issue_types(self._project_key, maxResults=False):
+            fields = self.jira_client.project_issue_fields(
+                self._project_key, issue_type.id, maxResults=False
+            )
+            if any(field.raw.get('fieldId') == 'priority' for field in fields):
+                supported.add(issue_type.name)
+        return frozenset(supported)
+
     def _init_anthropic(self) -> Anthropic:
         """Initialize Anthropic client."""
         api_key = os.getenv('ANTHROPIC_API_KEY')
@@ -101,74 +469,499 @@ class JiraSlackAgent:
         self.logger.info("Anthropic client initialized")
         return client
 
+    def _compile_prefilter(self) -> Optional[re.Pattern]:
+        """Compile the keyword pre-filter, or return None if it is disabled."""
+        if not self._ai.prefilter:
+            return None
+
+        keywords = self._ai.prefilter_keywords
+        if keywords:
+            pattern = "|".join(self._keyword_pattern(keyword) for keyword in keywords)
+        else:
+            pattern = DEFAULT_PREFILTER_PATTERN
+        return re.compile(pattern, re.IGNORECASE)
+
+    @staticmethod
+    def _keyword_pattern(keyword: str) -> str:
+        """Escape a keyword, anchoring it on word boundaries only where it starts/ends with a word character."""
+        start = r"\b" if re.match(r"\w", keyword) else ""
+        end = r"\b" if re.search(r"\w$", keyword) else ""
+        return f"{start}{re.escape(keyword)}{end}"
+
+    def _passes_prefilter(self, message_text: str) -> bool:
+        """Check whether a message has any bug/task signal worth an AI call."""
+        if self._signal_re is None:
+            return True
+        return len(message_text) >= self._ai.prefilter_min_length and self._signal_re.search(message_text) is not None
+
     def _register_handlers(self):
         """Register Slack event handlers."""
         @self.slack_app.event("message")
-        def handle_message(event, say, client):
+        async def handle_message(event, ack, say, client):
             """Handle incoming Slack messages."""
+            # Bolt already acks Events API requests before running listeners
+            # (process_before_response=False); this only makes that explicit
+            await ack()
+
             # Ignore bot messages and message subtypes (edits, deletes, etc.)
             if event.get('subtype') or event.get('bot_id'):
                 return
 
             # Check if message is from a monitored channel
             channel_id = event.get('channel')
-            channel_info = client.conversations_info(channel=channel_id)
-            channel_name = channel_info['channel']['name']
+            try:
+                channel_name = self._channel_name_by_id[channel_id]
+            except KeyError:
+                # Unknown channel (e.g. created after startup) - refresh the lookup
+                await self._refresh_channels(client)
+                channel_name = self._channel_name_by_id.get(channel_id)
+
+            if channel_id not in self._monitored_channel_ids:
+                return
 
-            monitored_channels = self.config['slack']['monitored_channels']
-            if channel_name not in monitored_channels:
+            # Skip events Slack redelivers after an ack timeout
+            if not await self._mark_seen(channel_id, event.get('ts')):
+                self.logger.debug(f"Skipping duplicate event {(channel_id, event.get('ts'))}")
+                return
+
+            if self._use_stream:
+                # Hand the message to whichever replica reads it from the stream first
+                await self._redis.xadd(
+                    REDIS_STREAM,
+                    {
+                        'channel': channel_id,
+                        'channel_name': channel_name,
+                        'ts': event.get('ts', ''),
+                        'user': event.get('user', ''),
+                        'text': event.get('text', '')
+                    },
+                    maxlen=REDIS_STREAM_MAXLEN,
+                    approximate=True
+                )
                 return
 
-            # Process the message
-            self._process_message(event, channel_name, client)
+            # Process the message in the background so the handler returns immediately
+            self._spawn(self._process_message_bounded(event, channel_name, client))
 
-    def _process_message(self, event: Dict, channel_name: str, client):
+    async def _refresh_channels(self, client, force: bool = False):
+        """
+        Resolve monitored channel names to channel IDs via conversations_list.
+
+        Refreshes are throttled so unknown channels can't trigger a lookup per message.
+        """
+        async with self._channels_lock:
+            if not force and time.monotonic() - self._channels_refreshed_at < CHANNEL_REFRESH_INTERVAL:
+                return
+
+            channel_name_by_id = {}
+            cursor = None
+            while True:
+                response = await client.conversations_list(
+                    types="public_channel",
+                    exclude_archived=True,
+                    limit=1000,
+                    cursor=cursor
+                )
+                for channel in response['channels']:
+                    channel_name_by_id[channel['id']] = channel['name']
+
+                cursor = response.get('response_metadata', {}).get('next_cursor')
+                if not cursor:
+                    break
+
+            monitored_names = self._monitored_channels
+            self._channel_name_by_id = channel_name_by_id
+            self._monitored_channel_ids = frozenset(
+                channel_id for channel_id, name in channel_name_by_id.items()
+                if name in monitored_names
+            )
+            self._channels_refreshed_at = time.monotonic()
+
+            missing = monitored_names - set(channel_name_by_id.values())
+            if missing:
+                self.logger.warning(f"Monitored channels not found: {', '.join(sorted(missing))}")
+            self.logger.info(f"Resolved {len(self._monitored_channel_ids)} monitored channel(s)")
+
+    async def _mark_seen(self, channel_id: str, ts: str) -> bool:
+        """
+        Record a message as handled.
+
+        Returns:
+            False if the message was already seen within SEEN_EVENTS_TTL
+        """
+        if self._redis is not None:
+            key = REDIS_SEEN_KEY.format(channel=channel_id, ts=ts)
+            return bool(await self._redis.set(key, 1, nx=True, ex=SEEN_EVENTS_TTL))
+
+        # No await happens between the check and the insert, so this is safe
+        # without a lock on the event loop
+        event_key = (channel_id, ts)
+        if event_key in self._seen_events:
+            return False
+        self._seen_events[event_key] = True
+        return True
+
+    async def _get_user(self, client, user_id: str) -> Tuple[str, str]:
+        """Return (real_name, email) for a Slack user, using the TTL cache when possible."""
+        key = REDIS_USER_KEY.format(user_id=user_id)
+        if self._redis is not None:
+            cached = await self._redis.hgetall(key)
+            if cached:
+                return cached['real_name'], cached['email']
+        else:
+            cached = self._user_cache.get(user_id)
+            if cached is not None:
+                return cached
+
+        user_info = await client.users_info(user=user_id)
+        user = (
+            user_info['user']['real_name'],
+            user_info['user'].get('profile', {}).get('email', 'unknown')
+        )
+
+        if self._redis is not None:
+            await (
+                self._redis.pipeline()
+                .hset(key, mapping={'real_name': user[0], 'email': user[1]})
+                .expire(key, USER_CACHE_TTL)
+                .execute()
+            )
+        else:
+            self._user_cache[user_id] = user
+        return user
+
+    async def _consume_stream(self):
+        """Process messages from the shared Redis stream as one consumer of the group."""
+        try:
+            await self._redis.xgroup_create(REDIS_STREAM, REDIS_GROUP, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+        self.logger.info(f"Consuming {REDIS_STREAM} as {self._consumer_name}")
+        client = self.slack_app.client
+        next_claim = 0.0
+
+        while True:
+            # Only read as many entries as there are free processing slots, so a busy
+            # replica leaves the rest of the stream to idle ones
+            slots = await self._acquire_free_slots()
+            entries = []
+            try:
+                if time.monotonic() >= next_claim:
+                    # Take over messages left pending by replicas that stopped mid-processing
+                    claimed = await self._redis.xautoclaim(
+                        REDIS_STREAM, REDIS_GROUP, self._consumer_name,
+                        min_idle_time=REDIS_CLAIM_IDLE_MS,
+                        count=slots
+                    )
+                    entries.extend(await self._drop_exhausted_entries(claimed[1]))
+                    next_claim = time.monotonic() + REDIS_CLAIM_INTERVAL
+
+                if len(entries) < slots:
+                    response = await self._redis.xreadgroup(
+                        REDIS_GROUP, self._consumer_name, {REDIS_STREAM: '>'},
+                        count=slots - len(entries),
+                        block=5000
+                    )
+                    for _, stream_entries in response or []:
+                        entries.extend(stream_entries)
+
+            except Exception as e:
+                self.logger.error(f"Error reading {REDIS_STREAM}: {str(e)}", exc_info=True)
+                await asyncio.sleep(5)
+
+            # Each spawned entry keeps one slot until it finishes; return the rest
+            for _ in range(slots - len(entries)):
+                self._message_slots.release()
+            for entry_id, fields in entries:
+                self._spawn(self._process_stream_entry(entry_id, fields, client))
+
+    async def _acquire_free_slots(self) -> int:
+        """Wait for one processing slot, then take every other free one; returns the count."""
+        await self._message_slots.acquire()
+        slots = 1
+        while slots < self._max_workers and not self._message_slots.locked():
+            await self._message_slots.acquire()
+            slots += 1
+        return slots
+
+    async def _drop_exhausted_entries(self, claimed: List) -> List:
+        """Dead-letter claimed entries that were delivered too often or have no payload.
+
+        Returns the entries that should still be processed.
+        """
+        entries = []
+        for entry_id, fields in claimed:
+            if fields:
+                entries.append((entry_id, fields))
+            else:
+                # Redis 6.2 returns entries deleted from the stream with a None payload
+                await self._dead_letter(entry_id, None, "entry has no payload")
+        if not entries:
+            return []
+
+        pending = await self._redis.xpending_range(
+            REDIS_STREAM, REDIS_GROUP,
+            min=entries[0][0], max=entries[-1][0],
+            count=len(claimed),
+            consumername=self._consumer_name
+        )
+        deliveries = {item['message_id']: item['times_delivered'] for item in pending}
+
+        remaining = []
+        for entry_id, fields in entries:
+            if deliveries.get(entry_id, 0) > REDIS_MAX_DELIVERIES:
+                await self._dead_letter(entry_id, fields, f"delivered {deliveries[entry_id]} times")
+            else:
+                remaining.append((entry_id, fields))
+        return remaining
+
+    async def _dead_letter(self, entry_id: str, fields: Optional[Dict], reason: str):
+        """Copy a stream entry to the dead-letter stream and acknowledge it."""
+        self.logger.warning(f"Dead-lettering stream entry {entry_id}: {reason}")
+        if fields:
+            await self._redis.xadd(
+                REDIS_DEAD_LETTER_STREAM,
+                {**fields, 'entry_id': entry_id, 'reason': reason},
+                maxlen=REDIS_STREAM_MAXLEN,
+                approximate=True
+            )
+        await self._redis.xack(REDIS_STREAM, REDIS_GROUP, entry_id)
+
+    async def _process_stream_entry(self, entry_id: str, fields: Dict, client):
+        """Process one stream entry and acknowledge it; releases its processing slot."""
+        try:
+            event = {
+                'channel': fields['channel'],
+                'ts': fields['ts'],
+                'user': fields['user'],
+                'text': fields['text']
+            }
+            await self._process_message(event, fields['channel_name'], client)
+            await self._redis.xack(REDIS_STREAM, REDIS_GROUP, entry_id)
+        except Exception as e:
+            self.logger.error(f"Error processing stream entry {entry_id}: {str(e)}", exc_info=True)
+        finally:
+            self._message_slots.release()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine as a background task, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _process_message_bounded(self, event: Dict, channel_name: str, client):
+        """Process a message once one of the max_workers slots is free."""
+        async with self._message_slots:
+            await self._process_message(event, channel_name, client)
+
+    async def _process_message(self, event: Dict, channel_name: str, client):
         """Process a Slack message to determine if it should create a Jira ticket."""
         message_text = event.get('text', '')
         user_id = event.get('user')
-        timestamp = event.get('ts')
+
+        if not self._passes_prefilter(message_text):
+            self.logger.debug(f"Pre-filter skipped message from #{channel_name}: {message_text[:50]}...")
+            return
+
+        if self._uses_message_batches(channel_name):
+            custom_id = self._batch_custom_id(event)
+            self._pending_batch_requests[custom_id] = (event, channel_name)
+            self.logger.info(f"Queued message from #{channel_name} for batch analysis: {message_text[:100]}...")
+            return
 
         self.logger.info(f"Processing message from #{channel_name}: {message_text[:100]}...")
 
         try:
-            # Use AI to analyze the message
-            should_create, ticket_info = self._analyze_message(message_text)
+            # Analyze the message and fetch user info concurrently
+            (should_create, ticket_info), (user_name, user_email) = await asyncio.gather(
+                self._analyze(message_text),
+                self._get_user(client, user_id)
+            )
 
             if should_create:
-                self.logger.info(f"AI determined ticket should be created: {ticket_info.get('summary')}")
-
-                # Get user info for better context
-                user_info = client.users_info(user=user_id)
-                user_name = user_info['user']['real_name']
-                user_email = user_info['user'].get('profile', {}).get('email', 'unknown')
-
-                # Create Jira ticket
-                issue = self._create_jira_ticket(
-                    ticket_info,
-                    reporter_name=user_name,
-                    reporter_email=user_email,
-                    slack_channel=channel_name,
-                    slack_message=message_text
+                await self._create_ticket_and_notify(
+                    event, channel_name, client, ticket_info, user_name, user_email
                 )
-
-                # Send notification
-                self._send_notification(
-                    client=client,
-                    issue_key=issue.key,
-                    issue_url=f"{self.config['jira']['url']}/browse/{issue.key}",
-                    original_message=message_text,
-                    channel_name=channel_name,
-                    user_id=user_id,
-                    thread_ts=timestamp
-                )
-
-                self.logger.info(f"Successfully created ticket {issue.key}")
             else:
                 self.logger.debug(f"AI determined no ticket needed for message: {message_text[:50]}...")
 
         except Exception as e:
             self.logger.error(f"Error processing message: {str(e)}", exc_info=True)
 
+    async def _create_ticket_and_notify(
+        self,
+        event: Dict,
+        channel_name: str,
+        client,
+        ticket_info: Dict,
+        user_name: str,
+        user_email: str
+    ):
+        """Create the Jira ticket for an analyzed message and notify Slack."""
+        message_text = event.get('text', '')
+
+        self.logger.info(f"AI determined ticket should be created: {ticket_info.get('summary')}")
+
+        # Create Jira ticket
+        issue = await asyncio.to_thread(
+            self._create_jira_ticket,
+            ticket_info,
+            reporter_name=user_name,
+            reporter_email=user_email,
+            slack_channel=channel_name,
+            slack_message=message_text
+        )
+
+        # Send notification
+        await self._send_notification(
+            client=client,
+            issue_key=issue.key,
+            issue_url=f"{self._jira_url}/browse/{issue.key}",
+            original_message=message_text,
+            channel_name=channel_name,
+            user_id=event.get('user'),
+            thread_ts=event.get('ts')
+        )
+
+        self.logger.info(f"Successfully created ticket {issue.key}")
+
+    def _uses_message_batches(self, channel_name: str) -> bool:
+        """Check whether a channel's messages go through the Message Batches API."""
+        return self._ai.batch_mode_channels.get(channel_name, self._ai.batch_mode)
+
+    @staticmethod
+    def _batch_custom_id(event: Dict) -> str:
+        """Build a Message Batches custom_id (letters, digits, - and _ only) from a Slack event."""
+        return f"{event.get('channel')}-{event.get('ts', '').replace('.', '_')}"
+
+    async def _run_message_batch_flushes(self):
+        """Periodically submit pending messages to the Message Batches API."""
+        flush_interval = self._ai.batch_flush_minutes * 60
+
+        while True:
+            await asyncio.sleep(flush_interval)
+            if not self._pending_batch_requests:
+                continue
+
+            pending, self._pending_batch_requests = self._pending_batch_requests, {}
+            self._spawn(self._process_message_batch(pending))
+
+    async def _process_message_batch(self, pending: Dict[str, Tuple[Dict, str]]):
+        """Submit a message batch, wait for it to end, then create tickets from the results."""
+        client = self.slack_app.client
+
+        try:
+            batch = await asyncio.to_thread(
+                self.anthropic_client.messages.batches.create,
+                requests=[
+                    {
+                        "custom_id": custom_id,
+                        "params": self._analysis_params(event.get('text', ''), self._ai.fast_model)
+                    }
+                    for custom_id, (event, _) in pending.items()
+                ]
+            )
+            self.logger.info(f"Submitted message batch {batch.id} with {len(pending)} message(s)")
+
+            while batch.processing_status != "ended":
+                await asyncio.sleep(BATCH_POLL_INTERVAL)
+                batch = await asyncio.to_thread(self.anthropic_client.messages.batches.retrieve, batch.id)
+
+            results = await asyncio.to_thread(self._fetch_batch_results, batch.id)
+
+        except Exception as e:
+            self.logger.error(f"Error processing message batch: {str(e)}", exc_info=True)
+            return
+
+        for custom_id, (event, channel_name) in pending.items():
+            message = results.get(custom_id)
+            if message is None:
+                self.logger.warning(f"No batch result for message {custom_id} in #{channel_name}")
+                continue
+
+            try:
+                if message.stop_reason == "max_tokens":
+                    # The tool input is incomplete; analyze again with a larger budget
+                    self.logger.warning(f"Batch result {custom_id} hit max_tokens, re-analyzing the message")
+                    should_create, ticket_info = await asyncio.to_thread(
+                        self._analyze_message, event.get('text', '')
+                    )
+                else:
+                    should_create, ticket_info = await asyncio.to_thread(
+                        self._resolve_decision, event.get('text', ''), self._tool_input(message)
+                    )
+                if should_create:
+                    user_name, user_email = await self._get_user(client, event.get('user'))
+                    await self._create_ticket_and_notify(
+                        event, channel_name, client, ticket_info, user_name, user_email
+                    )
+
+            except Exception as e:
+                self.logger.error(f"Error processing batch result {custom_id}: {str(e)}", exc_info=True)
+
+    def _fetch_batch_results(self, batch_id: str) -> Dict:
+        """Download the succeeded results of an ended message batch, keyed by custom_id."""
+        results = {}
+        for entry in self.anthropic_client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message
+            else:
+                self.logger.warning(f"Batch request {entry.custom_id} {entry.result.type}")
+        return results
+
+    async def _analyze(self, message_text: str) -> Tuple[bool, Optional[Dict]]:
+        """Analyze a message, batching it with other messages when batching is enabled."""
+        if self._analysis_queue is None:
+            return await asyncio.to_thread(self._analyze_message, message_text)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._analysis_queue.put((message_text, future))
+        return await future
+
+    async def _run_analysis_batches(self):
+        """Drain the analysis queue into batches of up to batch_max messages."""
+        loop = asyncio.get_running_loop()
+        batch_max = self._ai.batch_max
+        batch_window = self._ai.batch_window_ms / 1000
+
+        while True:
+            batch = [await self._analysis_queue.get()]
+            deadline = loop.time() + batch_window
+
+            while len(batch) < batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._analysis_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Analyze in the background so the next batch can start filling
+            self._spawn(self._dispatch_batch(batch))
+
+    async def _dispatch_batch(self, batch):
+        """Analyze a batch of queued messages and resolve their futures."""
+        message_texts = [message_text for message_text, _ in batch]
+
+        results = None
+        if len(message_texts) > 1:
+            results = await asyncio.to_thread(self._analyze_messages, message_texts)
+
+        if results is None:
+            # Single message, or the batched response was unusable
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._analyze_message, message_text)
+                for message_text in message_texts
+            ))
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
     def _analyze_message(self, message_text: str) -> Tuple[bool, Optional[Dict]]:
         """
         Use Claude AI to analyze if message should create a ticket.
@@ -176,81 +969,245 @@ class JiraSlackAgent:
         Returns:
             Tuple of (should_create_ticket, ticket_info_dict)
         """
-        detection_mode = self.config['ai']['detection_mode']
-        threshold = self.config['ai']['confidence_threshold']
+        try:
+            result = self._request_decision(message_text, self._ai.fast_model)
+            return self._resolve_decision(message_text, result)
+
+        except Exception as e:
+            self.logger.error(f"Error in AI analysis: {str(e)}", exc_info=True)
+            return False, None
+
+    def _request_decision(
+        self,
+        message_text: str,
+        model: str,
+        max_tokens: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Stream a single-message decision from Claude.
 
-        prompt = f"""Analyze the following Slack message and determine if it describes a bug report, task request, or issue that should be tracked in Jira.
+        Returns:
+            The decision dict, or None if the model decided against a ticket
+            and the stream was stopped early
+        """
+        max_tokens = max_tokens or self._ai.max_tokens
+        params = self._analysis_params(message_text, model)
+        params['max_tokens'] = max_tokens
+
+        tool_json = ""
+        decided = False
+        with self.anthropic_client.messages.stream(**params) as stream:
+            for event in stream:
+                if event.type != "content_block_delta" or event.delta.type != "input_json_delta":
+                    continue
+                tool_json += event.delta.partial_json
+
+                # Stop as soon as the model has decided against a ticket
+                if not decided:
+                    match = DECISION_FIELD_RE.search(tool_json)
+                    if match:
+                        decided = True
+                        if match.group(1) == "false":
+                            self.logger.debug(f"AI Analysis ({model}) - Should create: False (stopped stream early)")
+                            return None
+
+            truncated = stream.get_final_message().stop_reason == "max_tokens"
+
+        if truncated:
+            # The tool input is incomplete JSON; ask again with room for the whole decision
+            if max_tokens > self._ai.max_tokens:
+                raise ValueError(f"Decision from {model} exceeded max_tokens ({max_tokens})")
+            self.logger.warning(
+                f"Decision from {model} hit max_tokens ({max_tokens}), "
+                f"retrying with {max_tokens * MAX_TOKENS_RETRY_FACTOR}"
+            )
+            return self._request_decision(message_text, model, max_tokens * MAX_TOKENS_RETRY_FACTOR)
 
-Message: "{message_text}"
+        return json_loads(tool_json)
 
-Detection mode: {detection_mode} (be {"generous and create tickets for anything that might need tracking" if detection_mode == "liberal" else "strict and only create tickets for clear bug reports or task requests"})
+    def _resolve_decision(self, message_text: str, result: Optional[Dict]) -> Tuple[bool, Optional[Dict]]:
+        """
+        Re-check an uncertain fast-model decision with the escalation model,
+        then apply the confidence threshold.
+        """
+        escalation_model = self._ai.escalation_model
+        low, high = self._ai.escalation_band
+
+        if (
+            result is not None and
+            escalation_model and escalation_model != self._ai.fast_model and
+            low <= result.get('confidence', 0) <= high
+        ):
+            with self._tier_hits_lock:
+                self._tier_hits['escalated'] += 1
+            self.logger.debug(f"Escalating uncertain decision (confidence {result.get('confidence')}) to {escalation_model}")
+            try:
+                result = self._request_decision(message_text, escalation_model)
+            except Exception as e:
+                # Keep the fast-model decision rather than losing the message
+                self.logger.error(
+                    f"Escalation to {escalation_model} failed, using fast-model decision: {str(e)}",
+                    exc_info=True
+                )
+        else:
+            with self._tier_hits_lock:
+                self._tier_hits['fast'] += 1
 
-Please respond with a JSON object containing:
-{{
-    "should_create_ticket": true/false,
-    "confidence": 0.0-1.0,
-    "issue_type": "Bug" | "Task" | "Story" | "Improvement",
-    "summary": "Brief one-line summary (max 100 chars)",
-    "description": "Detailed description extracted from the message",
-    "priority": "Highest" | "High" | "Medium" | "Low" | "Lowest",
-    "reasoning": "Brief explanation of your decision"
-}}
+        self.logger.debug(f"Classifier tier hits - fast: {self._tier_hits['fast']}, escalated: {self._tier_hits['escalated']}")
 
-Guidelines:
-- For bugs: Look for error messages, unexpected behavior, crashes, or things not working
-- For tasks: Look for requests to implement features, make changes, or do work
-- For improvements: Look for suggestions to enhance existing functionality
-- Summary should be concise and actionable
-- Description should include relevant details from the message
-- Set appropriate priority based on urgency indicators in the message
-- Confidence threshold is {threshold} - only create tickets if confidence is above this
+        if result is None:
+            return False, None
+        return self._to_ticket_decision(result, self._ai.confidence_threshold, message_text)
+
+    def _analysis_params(self, message_text: str, model: str) -> Dict:
+        """Build the messages.create parameters for analyzing a single message."""
+        prompt = MESSAGE_PROMPT_TEMPLATE.format(message_text=self._truncate_for_ai(message_text))
+
+        return {
+            "model": model,
+            "max_tokens": self._ai.max_tokens,
+            "system": self._system_blocks,
+            "tools": [TICKET_DECISION_TOOL],
+            "tool_choice": {"type": "tool", "name": TICKET_DECISION_TOOL['name']},
+            "messages": [{
+                "role": "user",
+                "content": prompt
+            }]
+        }
 
-Respond with ONLY the JSON object, no other text."""
+    def _truncate_for_ai(self, message_text: str) -> str:
+        """
+        Cap the message size sent to Claude, keeping the start (the description)
+        and the end (usually the final error line of a pasted log).
+        """
+        max_chars = self._ai.max_chars
+        if len(message_text) <= max_chars:
+            return message_text
+
+        tail_chars = max_chars // 4
+        if tail_chars <= 0:
+            # Too small to keep both ends; message_text[-0:] would be the whole message
+            return message_text[:max(max_chars, 0)]
+        return (
+            message_text[:max_chars - tail_chars] +
+            "\n...[truncated]...\n" +
+            message_text[-tail_chars:]
+        )
+
+    def _analyze_messages(self, message_texts: List[str]) -> Optional[List[Tuple[bool, Optional[Dict]]]]:
+        """
+        Use Claude AI to analyze several messages in a single request.
+
+        Returns:
+            List of (should_create_ticket, ticket_info_dict) in message order,
+            or None if the batched response could not be used
+        """
+        messages_block = "\n\n".join(
+            f'Message {i}: "{self._truncate_for_ai(message_text)}"'
+            for i, message_text in enumerate(message_texts, 1)
+        )
+
+        prompt = f"{messages_block}\n\nRecord {len(message_texts)} decisions, one per message in the same order."
 
         try:
             response = self.anthropic_client.messages.create(
-                model=self.config['ai']['model'],
-                max_tokens=1024,
+                model=self._ai.fast_model,
+                max_tokens=self._ai.max_tokens * len(message_texts),
+                system=self._system_blocks,
+                tools=[TICKET_DECISIONS_TOOL],
+                tool_choice={"type": "tool", "name": TICKET_DECISIONS_TOOL['name']},
                 messages=[{
                     "role": "user",
                     "content": prompt
                 }]
             )
 
-            # Parse the response
-            response_text = response.content[0].text.strip()
+            if response.stop_reason == "max_tokens":
+                self.logger.warning(
+                    f"Batched AI analysis of {len(message_texts)} messages hit max_tokens, "
+                    f"falling back to per-message analysis"
+                )
+                return None
 
-            # Remove markdown code blocks if present
-            if response_text.startswith('```'):
-                response_text = response_text.split('```')[1]
-                if response_text.startswith('json'):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+            results = self._tool_input(response).get('decisions')
+            if not isinstance(results, list) or len(results) != len(message_texts):
+                self.logger.warning(
+                    f"Batched AI analysis returned an unexpected result for {len(message_texts)} messages, "
+                    f"falling back to per-message analysis"
+                )
+                return None
 
-            result = json.loads(response_text)
+            self.logger.debug(f"Batched AI analysis of {len(message_texts)} messages")
+            return [
+                self._resolve_decision(message_text, result)
+                for message_text, result in zip(message_texts, results)
+            ]
 
-            # Check confidence threshold
-            should_create = (
-                result.get('should_create_ticket', False) and
-                result.get('confidence', 0) >= threshold
-            )
+        except Exception as e:
+            self.logger.error(f"Error in batched AI analysis: {str(e)}", exc_info=True)
+            return None
 
-            self.logger.debug(f"AI Analysis - Should create: {should_create}, Confidence: {result.get('confidence')}, Reasoning: {result.get('reasoning')}")
+    def _build_system_prompt(self) -> List[Dict]:
+        """
+        Build the cached system block for analysis requests.
 
-            if should_create:
-                return True, {
-                    'summary': result.get('summary'),
-                    'description': result.get('description'),
-                    'issue_type': result.get('issue_type', self.config['jira']['default_issue_type']),
-                    'priority': result.get('priority', self.config['jira']['default_priority'])
-                }
-            else:
-                return False, None
+        Detection mode and threshold are fixed for the life of the process, so they
+        are folded into the cached prefix and only the messages vary per call.
+        """
+        detection_mode = self._ai.detection_mode
+        mode_hint = DETECTION_MODE_HINTS.get(detection_mode, DETECTION_MODE_HINTS["conservative"])
+
+        return [{
+            "type": "text",
+            "text": SYSTEM_PROMPT_TEMPLATE.format(
+                threshold=self._ai.confidence_threshold,
+                detection_mode=detection_mode,
+                mode_hint=mode_hint
+            ),
+            "cache_control": {"type": "ephemeral"}
+        }]
+
+    @staticmethod
+    def _tool_input(response) -> Dict:
+        """Return the structured input of the tool call in a Claude response."""
+        for block in response.content:
+            if block.type == "tool_use":
+                return block.input
+        raise ValueError("Claude response did not contain a tool call")
+
+    def _to_ticket_decision(
+        self,
+        result: Dict,
+        threshold: float,
+        message_text: str
+    ) -> Tuple[bool, Optional[Dict]]:
+        """Turn a parsed AI decision into (should_create_ticket, ticket_info_dict)."""
+        # Check confidence threshold
+        should_create = (
+            result.get('should_create_ticket', False) and
+            result.get('confidence', 0) >= threshold
+        )
 
-        except Exception as e:
-            self.logger.error(f"Error in AI analysis: {str(e)}", exc_info=True)
+        self.logger.debug(f"AI Analysis - Should create: {should_create}, Confidence: {result.get('confidence')}, Reasoning: {result.get('reasoning')}")
+
+        if should_create:
+            # Tool use without strict mode does not guarantee every field is present
+            return True, {
+                # Jira rejects an empty summary, so fall back to the message's first line
+                'summary': result.get('summary') or self._fallback_summary(message_text),
+                'description': result.get('description') or '',
+                'issue_type': result.get('issue_type', self._default_issue_type),
+                'priority': result.get('priority', self._default_priority)
+            }
+        else:
             return False, None
 
+    @staticmethod
+    def _fallback_summary(message_text: str) -> str:
+        """Build a summary Jira accepts from the first non-empty line of a message."""
+        first_line = next((line.strip() for line in message_text.splitlines() if line.strip()), "")
+        return first_line[:SUMMARY_MAX_CHARS] or "Slack message"
+
     def _create_jira_ticket(
         self,
         ticket_info: Dict,
@@ -262,47 +1219,96 @@ Respond with ONLY the JSON object, no other text."""
         """Create a Jira ticket with the extracted information."""
 
         # Build description with context
-        description = f"""*Reported by:* {reporter_name} ({reporter_email})
-*Slack Channel:* #{slack_channel}
-*Original Message:*
-{{quote}}
-{slack_message}
-{{quote}}
-
----
-
-*AI-Generated Description:*
-{ticket_info['description']}
-
----
-_This ticket was automatically created by the Jira-Slack AI Agent on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
-"""
+        created_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        description = "\n".join([
+            f"*Reported by:* {reporter_name} ({reporter_email})",
+            f"*Slack Channel:* #{slack_channel}",
+            "*Original Message:*",
+            "{quote}",
+            slack_message,
+            "{quote}",
+            "",
+            "---",
+            "",
+            "*AI-Generated Description:*",
+            ticket_info['description'],
+            "",
+            "---",
+            f"_This ticket was automatically created by the Jira-Slack AI Agent on {created_at}_",
+            ""
+        ])
 
         # Create the issue
         issue_dict = {
-            'project': {'key': self.config['jira']['project_key']},
+            'project': {'key': self._project_key},
             'summary': ticket_info['summary'],
             'description': description,
             'issuetype': {'name': ticket_info['issue_type']},
         }
 
-        # Add priority if supported
-        try:
+        # Add priority if the project's create screen accepts it
+        if self._priority_issue_types is None or ticket_info['issue_type'] in self._priority_issue_types:
             issue_dict['priority'] = {'name': ticket_info['priority']}
-        except:
-            pass  # Priority might not be available in all Jira configurations
 
-        issue = self.jira_client.create_issue(fields=issue_dict)
+        issue = self._create_issue_with_retry(issue_dict)
 
         self.logger.info(f"Created Jira ticket {issue.key}: {ticket_info['summary']}")
 
         # Transition to desired initial status if configured
-        desired_status = self.config['jira'].get('initial_status')
+        desired_status = self._initial_status
         if desired_status:
-            self._set_issue_status(issue, desired_status)
+            try:
+                created = self._fetch_issue_with_retry(issue.key)
+            except Exception as e:
+                # The ticket exists; report it even if its status can't be set
+                self.logger.error(f"Error fetching {issue.key} to set its status: {str(e)}", exc_info=True)
+            else:
+                self._set_issue_status(created, desired_status)
 
         return issue
 
+    @jira_write_retry
+    def _create_issue_with_retry(self, fields: Dict):
+        """Create a Jira issue, retrying only failures where nothing was created."""
+        # Without prefetch the call is just the POST; a failed follow-up GET
+        # must not be retried as part of the write
+        return self.jira_client.create_issue(fields=fields, prefetch=False)
+
+    @jira_read_retry
+    def _fetch_issue_with_retry(self, issue_key: str):
+        """Fetch an issue, retrying rate limits and server errors."""
+        return self.jira_client.issue(issue_key)
+
+    @jira_read_retry
+    def _transitions_with_retry(self, issue) -> List[Dict]:
+        """List an issue's available transitions, retrying rate limits and server errors."""
+        return self.jira_client.transitions(issue)
+
+    @jira_write_retry
+    def _transition_issue_with_retry(self, issue, transition_id: str):
+        """Transition an issue, retrying only failures where nothing was applied."""
+        self.jira_client.transition_issue(issue, transition_id)
+
+    def _get_cached_transition(self, cache_key: Tuple[str, str, str, str]) -> Optional[str]:
+        """Look up a cached transition ID, shared through Redis when configured."""
+        if self._redis_sync is not None:
+            return self._redis_sync.hget(REDIS_TRANSITIONS_KEY, "|".join(cache_key))
+        return self._transition_cache.get(cache_key)
+
+    def _cache_transition(self, cache_key: Tuple[str, str, str, str], transition_id: str):
+        """Remember the transition ID for a project/issue type/status pair."""
+        if self._redis_sync is not None:
+            self._redis_sync.hset(REDIS_TRANSITIONS_KEY, "|".join(cache_key), transition_id)
+        else:
+            self._transition_cache[cache_key] = transition_id
+
+    def _evict_transition(self, cache_key: Tuple[str, str, str, str]):
+        """Forget a cached transition ID."""
+        if self._redis_sync is not None:
+            self._redis_sync.hdel(REDIS_TRANSITIONS_KEY, "|".join(cache_key))
+        else:
+            self._transition_cache.pop(cache_key, None)
+
     def _set_issue_status(self, issue, desired_status: str):
         """
         Transition an issue to the desired status if it's not already there.
@@ -312,40 +1318,55 @@ _This ticket was automatically created by the Jira-Slack AI Agent on {datetime.n
             desired_status: The status name to transition to (e.g., "To Do")
         """
         try:
-            # Refresh issue to get current status
-            issue = self.jira_client.issue(issue.key)
+            # The issue was fetched right after creation, so its status is current
             current_status = issue.fields.status.name
 
             if current_status == desired_status:
                 self.logger.debug(f"Issue {issue.key} already in '{desired_status}' status")
                 return
 
-            # Get available transitions
-            transitions = self.jira_client.transitions(issue)
-
-            # Find the transition that leads to the desired status
-            target_transition = None
-            for transition in transitions:
-                if transition['to']['name'] == desired_status:
-                    target_transition = transition
-                    break
-
-            if target_transition:
-                self.jira_client.transition_issue(issue, target_transition['id'])
-                self.logger.info(f"Transitioned {issue.key} from '{current_status}' to '{desired_status}'")
-            else:
-                # Log available transitions for debugging
-                available = [t['to']['name'] for t in transitions]
-                self.logger.warning(
-                    f"Cannot transition {issue.key} to '{desired_status}'. "
-                    f"Current status: '{current_status}'. "
-                    f"Available transitions: {', '.join(available)}"
-                )
+            # Workflows are stable per project/issue type, so reuse a known transition
+            cache_key = (
+                issue.fields.project.key,
+                issue.fields.issuetype.name,
+                current_status,
+                desired_status
+            )
+            transition_id = self._get_cached_transition(cache_key)
+
+            if transition_id is None:
+                # Get available transitions
+                transitions = self._transitions_with_retry(issue)
+
+                # Find the transition that leads to the desired status
+                for transition in transitions:
+                    if transition['to']['name'] == desired_status:
+                        transition_id = transition['id']
+                        self._cache_transition(cache_key, transition_id)
+                        break
+                else:
+                    # Log available transitions for debugging
+                    available = [t['to']['name'] for t in transitions]
+                    self.logger.warning(
+                        f"Cannot transition {issue.key} to '{desired_status}'. "
+                        f"Current status: '{current_status}'. "
+                        f"Available transitions: {', '.join(available)}"
+                    )
+                    return
+
+            try:
+                self._transition_issue_with_retry(issue, transition_id)
+            except Exception:
+                # The workflow may have changed; look the transition up again next time
+                self._evict_transition(cache_key)
+                raise
+
+            self.logger.info(f"Transitioned {issue.key} from '{current_status}' to '{desired_status}'")
 
         except Exception as e:
             self.logger.error(f"Error setting status for {issue.key}: {str(e)}", exc_info=True)
 
-    def _send_notification(
+    async def _send_notification(
         self,
         client,
         issue_key: str,
@@ -356,7 +1377,7 @@ _This ticket was automatically created by the Jira-Slack AI Agent on {datetime.n
         thread_ts: str
     ):
         """Send notification about the created ticket."""
-        notification_channel = self.config['slack']['notification_channel']
+        notification_channel = self._notification_channel
 
         # Create a rich notification message
         message = f":white_check_mark: *Jira Ticket Created*\n\n" \
@@ -365,18 +1386,18 @@ _This ticket was automatically created by the Jira-Slack AI Agent on {datetime.n
                   f"*Original Message:*\n```{original_message[:200]}{'...' if len(original_message) > 200 else ''}```"
 
         try:
-            # Post to notification channel
-            client.chat_postMessage(
-                channel=notification_channel,
-                text=message,
-                unfurl_links=False
-            )
-
-            # Also reply in the original thread
-            client.chat_postMessage(
-                channel=channel_name,
-                thread_ts=thread_ts,
-                text=f":ticket: Created Jira ticket: <{issue_url}|{issue_key}>"
+            # Post to notification channel and reply in the original thread
+            await asyncio.gather(
+                client.chat_postMessage(
+                    channel=notification_channel,
+                    text=message,
+                    unfurl_links=False
+                ),
+                client.chat_postMessage(
+                    channel=channel_name,
+                    thread_ts=thread_ts,
+                    text=f":ticket: Created Jira ticket: <{issue_url}|{issue_key}>"
+                )
             )
 
             self.logger.info(f"Sent notification for {issue_key}")
@@ -396,15 +1417,66 @@ _This ticket was automatically created by the Jira-Slack AI Agent on {datetime.n
             )
 
         self.logger.info("Starting Jira-Slack Agent in Socket Mode...")
-        handler = SocketModeHandler(self.slack_app, app_token)
-        handler.start()
+        asyncio.run(self._start_async(app_token))
+
+    def start_worker(self):
+        """Start a worker replica that only drains the shared Redis stream."""
+        if not self._use_stream:
+            raise ValueError("Worker mode requires redis.url and redis.stream: true in config.yaml")
+
+        self.logger.info("Starting Jira-Slack Agent worker...")
+        asyncio.run(self._start_worker_async())
+
+    def _setup_event_loop(self):
+        """Create the thread pool, asyncio primitives and background tasks on the running loop."""
+        # Blocking SDK calls run via asyncio.to_thread on this bounded pool;
+        # asyncio.run shuts it down on exit
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="msg-worker")
+        )
+
+        # asyncio primitives must be created on the running loop (Python 3.9)
+        self._channels_lock = asyncio.Lock()
+        self._message_slots = asyncio.Semaphore(self._max_workers)
+        if self._ai.batch_max > 1:
+            self._analysis_queue = asyncio.Queue()
+            self._spawn(self._run_analysis_batches())
+        if self._ai.batch_mode or self._ai.batch_mode_channels:
+            self._spawn(self._run_message_batch_flushes())
+
+    async def _start_async(self, app_token: str):
+        """Run the Socket Mode handler on the asyncio event loop."""
+        self._setup_event_loop()
+        if self._use_stream:
+            self._spawn(self._consume_stream())
+
+        await self._refresh_channels(self.slack_app.client, force=True)
+
+        handler = AsyncSocketModeHandler(self.slack_app, app_token)
+        await handler.start_async()
+
+    async def _start_worker_async(self):
+        """Run the stream consumer on the asyncio event loop."""
+        self._setup_event_loop()
+        await self._consume_stream()
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Jira-Slack AI Agent")
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help="only process messages from the shared Redis stream (no Socket Mode connection)"
+    )
+    args = parser.parse_args()
+
     try:
         agent = JiraSlackAgent()
-        agent.start()
+        if args.worker:
+            agent.start_worker()
+        else:
+            agent.start()
     except KeyboardInterrupt:
         print("\n\nShutting down gracefully...")
     except Exception as e:
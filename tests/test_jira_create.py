@@ -0,0 +1,46 @@
+import json
+import logging
+from unittest import mock
+
+import requests
+from jira import JIRA, JIRAError
+from tenacity import wait_none
+
+import agent
+
+
+def _created_response():
+    response = requests.Response()
+    response.status_code = 201
+    response._content = json.dumps({
+        'id': '10001',
+        'key': 'PROJ-1',
+        'self': 'https://jira.example/rest/api/2/issue/10001'
+    }).encode()
+    return response
+
+
+def _make_agent(jira_client):
+    bot = agent.JiraSlackAgent.__new__(agent.JiraSlackAgent)
+    bot.logger = logging.getLogger('test')
+    bot.jira_client = jira_client
+    bot._project_key = 'PROJ'
+    bot._priority_issue_types = None
+    bot._initial_status = 'To Do'
+    return bot
+
+
+def test_failed_fetch_after_create_does_not_repeat_post():
+    jira_client = JIRA(server='https://jira.example', get_server_info=False, max_retries=0)
+    ticket_info = {'summary': 'Login fails', 'description': 'Broken', 'issue_type': 'Bug', 'priority': 'High'}
+
+    with mock.patch.object(jira_client._session, 'post', return_value=_created_response()) as post, \
+            mock.patch.object(jira_client, 'issue', side_effect=JIRAError(status_code=429)) as fetch, \
+            mock.patch.object(agent.JiraSlackAgent._fetch_issue_with_retry.retry, 'wait', wait_none()):
+        issue = _make_agent(jira_client)._create_jira_ticket(
+            ticket_info, 'Ann', 'ann@example.com', 'bugs', 'login is broken'
+        )
+
+    assert post.call_count == 1
+    assert fetch.call_count == agent.JIRA_RETRY_ATTEMPTS
+    assert issue.key == 'PROJ-1'